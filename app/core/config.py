@@ -22,8 +22,19 @@ class Settings:
     COLLECTION_TESTCASES: str = "multilevel_test_cases_mongo"
     COLLECTION_USERS: str = "users"
     COLLECTION_AUDIT: str = "api_audit_logs"
+    COLLECTION_UPLOAD_JOBS: str = "upload_jobs"
+    COLLECTION_ENRICHMENT_CACHE: str = "enrichment_cache"
+
+    MONGO_INSERT_CHUNK_SIZE: int = 1000
+    MONGO_INSERT_CONCURRENCY: int = 4
+    UPLOAD_INSERT_IDLE_FLUSH_SECONDS: float = 2.0
+    UPLOAD_PARALLEL_MIN_ROWS: int = 20000
+    UPLOAD_PARALLEL_WORKERS: int | None = None  # None → min(4, usable CPUs)
+    UPLOAD_JOB_HEARTBEAT_SECONDS: float = 30.0
+    UPLOAD_JOB_STALE_SECONDS: float = 300.0  # no heartbeat → job is dead
 
     EMBEDDING_MODEL_NAME: str = "all-MiniLM-L6-v2"
+    EMBEDDING_BATCH_SIZE: int = 64
     VECTOR_INDEX_NAME: str = "vector_index"
 
     CANDIDATES_TO_RETRIEVE: int = 15
@@ -37,6 +48,7 @@ class Settings:
     DIVERSITY_PER_FEATURE: bool = True
     GEMINI_RATE_LIMIT_SLEEP: float = 0.5
     GEMINI_RETRIES: int = 2
+    GEMINI_MAX_CONCURRENCY: int = 8
 
     CACHE_TTL_SECONDS: int = 60 * 5
 
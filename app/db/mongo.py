@@ -1,6 +1,17 @@
-from typing import Optional
-
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+import asyncio
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId, encode
+from bson.raw_bson import RawBSONDocument
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorCollection,
+    AsyncIOMotorDatabase,
+)
+from pymongo import WriteConcern
+from pymongo.errors import BulkWriteError
 
 from app.core.config import get_settings
 from app.core.logging import logger
@@ -88,3 +99,147 @@ def get_users_collection():
         return db[settings.COLLECTION_USERS]
     except Exception:
         raise
+
+
+def get_upload_jobs_collection():
+    try:
+        db = get_db()
+        return db[settings.COLLECTION_UPLOAD_JOBS]
+    except Exception:
+        raise
+
+
+def get_enrichment_cache_collection():
+    try:
+        db = get_db()
+        return db[settings.COLLECTION_ENRICHMENT_CACHE]
+    except Exception:
+        raise
+
+
+async def fail_stale_upload_jobs(job_id: Optional[str] = None) -> int:
+    """
+    Marks queued/processing upload jobs as failed once their heartbeat
+    (UpdatedAt) is older than UPLOAD_JOB_STALE_SECONDS — i.e. the process
+    running them restarted or died. Optionally limited to one job.
+    """
+
+    now = datetime.now(timezone.utc)
+
+    query: Dict[str, Any] = {
+        "status": {"$in": ["queued", "processing"]},
+        "UpdatedAt": {
+            "$lt": now - timedelta(seconds=settings.UPLOAD_JOB_STALE_SECONDS)
+        },
+    }
+
+    if job_id is not None:
+        query["_id"] = job_id
+
+    result = await get_upload_jobs_collection().update_many(
+        query,
+        {"$set": {
+            "status": "failed",
+            "error": "Upload job interrupted (server restarted or crashed).",
+            "UpdatedAt": now,
+        }},
+    )
+
+    return result.modified_count
+
+
+def _encode_raw_documents(
+    chunk: List[Dict[str, Any]],
+) -> List[RawBSONDocument]:
+    """
+    Pre-encodes a chunk to BSON so insert_many ships the bytes as-is.
+    RawBSONDocuments are immutable, so _id is assigned here the same way
+    pymongo would.
+    """
+
+    raw_docs = []
+
+    for doc in chunk:
+        if isinstance(doc, RawBSONDocument):
+            raw_docs.append(doc)
+            continue
+
+        if "_id" not in doc:
+            doc["_id"] = ObjectId()
+
+        raw_docs.append(RawBSONDocument(encode(doc)))
+
+    return raw_docs
+
+
+async def insert_many_chunked(
+    col: AsyncIOMotorCollection,
+    documents: Iterable[Dict[str, Any]],
+    chunk_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> Tuple[int, int]:
+    """
+    Bulk insert split into unordered chunks (kept well under the 16MB
+    command limit) and sent concurrently with a small in-flight cap.
+
+    Documents may be a lazy iterable; a chunk is only pulled from it once
+    an insert slot is free, so at most `concurrency` chunks are resident.
+    Each chunk is pre-encoded to RawBSONDocument in a worker thread.
+
+    A failing document does not abort the rest of its chunk. Returns
+    (inserted, rejected) so callers can report documents the server
+    refused instead of treating a partial write as success.
+    """
+
+    chunk_size = max(1, chunk_size or settings.MONGO_INSERT_CHUNK_SIZE)
+    semaphore = asyncio.Semaphore(
+        max(1, concurrency or settings.MONGO_INSERT_CONCURRENCY)
+    )
+    target = col.with_options(write_concern=WriteConcern(w=1))
+
+    async def _insert_chunk(chunk: List[Dict[str, Any]]) -> Tuple[int, int]:
+        try:
+            # BSON encoding runs off the event loop while other chunks are
+            # on the wire
+            raw_chunk = await asyncio.to_thread(_encode_raw_documents, chunk)
+            result = await target.insert_many(raw_chunk, ordered=False)
+            return len(result.inserted_ids), 0
+        except BulkWriteError as err:
+            inserted = err.details.get("nInserted", 0)
+            write_errors = err.details.get("writeErrors", []) or []
+            logger.error(
+                f"Bulk insert chunk partially failed: "
+                f"{len(chunk) - inserted} of {len(chunk)} documents rejected"
+                + (f" (first error: {write_errors[0].get('errmsg')})"
+                   if write_errors else "")
+            )
+            return inserted, len(chunk) - inserted
+        finally:
+            semaphore.release()
+
+    tasks = []
+    iterator = iter(documents)
+
+    try:
+        while True:
+            await semaphore.acquire()
+
+            chunk = list(islice(iterator, chunk_size))
+
+            if not chunk:
+                semaphore.release()
+                break
+
+            tasks.append(asyncio.create_task(_insert_chunk(chunk)))
+
+        counts = await asyncio.gather(*tasks)
+
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    return (
+        sum(inserted for inserted, _ in counts),
+        sum(rejected for _, rejected in counts),
+    )
@@ -5,8 +5,9 @@ from contextlib import asynccontextmanager
 
 from app.core.config import get_settings
 from app.core.logging import logger
-from app.db.mongo import ping_db, close_db
+from app.db.mongo import ping_db, close_db, fail_stale_upload_jobs
 from app.services.embeddings import load_embedding_model, unload_embedding_model
+from app.services.testcase_assembly import shutdown_assembly_pool
 from app.routes import auth, upload, search, admin, update
 
 
@@ -38,6 +39,14 @@ async def lifespan(app: FastAPI):
             exc_info=True,
         )
 
+    # Upload jobs orphaned by a previous run
+    try:
+        stale_jobs = await fail_stale_upload_jobs()
+        if stale_jobs:
+            logger.warning(f"Marked {stale_jobs} interrupted upload job(s) as failed")
+    except Exception as e:
+        logger.warning(f"Stale upload job cleanup failed: {e}")
+
     # Embeddings
     try:
         await load_embedding_model()
@@ -81,6 +90,13 @@ async def lifespan(app: FastAPI):
             f"Embedding model unload encountered an issue: {e}"
         )
 
+    try:
+        shutdown_assembly_pool()
+    except Exception as e:
+        logger.warning(
+            f"Assembly pool shutdown encountered an issue: {e}"
+        )
+
     logger.info("Lifespan shutdown complete")
 
 
@@ -6,9 +6,9 @@ from app.db.mongo import get_testcase_collection
 from app.models.schemas import UpdateTestCaseRequest
 
 # CORRECT EMBEDDING FUNCTIONS
-from app.services.embeddings import embed_multivector
+from app.services.embeddings import embed_multivector, to_fp16_binary
 
-from app.services.enrichment import get_gemini_enrichment
+from app.services.enrichment import get_gemini_enrichment_async
 
 
 router = APIRouter()
@@ -109,7 +109,7 @@ async def update_test_case(
                 or not updated_doc.get("TestCaseSummary")
                 or not updated_doc.get("TestCaseKeywords")
             ):
-                enrichment = get_gemini_enrichment(
+                enrichment = await get_gemini_enrichment_async(
                     updated_doc.get("Test Case Description", ""),
                     updated_doc.get("Feature", ""),
                     updated_doc.get("Steps", ""),
@@ -149,9 +149,9 @@ async def update_test_case(
                 detail="Failed rebuilding embeddings for test case.",
             )
 
-        updated_doc["desc_embedding"] = desc_emb
-        updated_doc["steps_embedding"] = steps_emb
-        updated_doc["summary_embedding"] = summary_emb
+        updated_doc["desc_embedding"] = to_fp16_binary(desc_emb)
+        updated_doc["steps_embedding"] = to_fp16_binary(steps_emb)
+        updated_doc["summary_embedding"] = to_fp16_binary(summary_emb)
         updated_doc["main_vector"] = main_vector
 
 
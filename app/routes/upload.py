@@ -1,19 +1,43 @@
-import io
+import asyncio
+import csv
+import os
+import tempfile
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException, Depends
 
+from app.core.config import get_settings
 from app.core.logging import logger
 from app.core.security import require_role
-from app.db.mongo import get_testcase_collection
+from app.db.mongo import (
+    fail_stale_upload_jobs,
+    get_testcase_collection,
+    get_upload_jobs_collection,
+    insert_many_chunked,
+)
 
 # CORRECT EMBEDDING API
-from app.services.embeddings import embed_multivector
+from app.services.embeddings import embed_multivector_matrices, to_fp16_binary
 
 # GEMINI ENRICHMENT
-from app.services.enrichment import get_gemini_enrichment
+from app.services.enrichment import (
+    get_cached_enrichments,
+    get_gemini_enrichment_async,
+)
+
+# PER-TEST-CASE ASSEMBLY (CPU-BOUND, POOLED)
+from app.services.testcase_assembly import (
+    STEP_COLUMNS,
+    GroupPositions,
+    build_case_inputs_parallel,
+    test_case_row_positions,
+)
 
 # AI DEDUPE PIPELINE
 from app.services.dedupe_summary import generate_dedupe_summary
@@ -22,180 +46,368 @@ from app.services.dedupe_verifier import llm_verify_duplicate
 
 
 router = APIRouter()
+settings = get_settings()
+
+_ALLOWED_EXTENSIONS = {".csv", ".xlsx"}
+
+_UPLOAD_READ_CHUNK_BYTES = 1 << 20
+
+_CASE_FIELDS = (
+    "test_case_id",
+    "feature",
+    "description",
+    "prerequisites",
+    "steps_combined",
+    "tags",
+    "priority",
+    "platform",
+)
+
+_VECTOR_FIELDS = (
+    "desc_embedding",
+    "steps_embedding",
+    "summary_embedding",
+    "main_vector",
+)
+
+# Only these columns are read downstream; everything else is left untouched
+_USED_COLUMNS = [
+    "Test Case ID",
+    "Feature",
+    "Test Case Description",
+    "Pre-requisites",
+    "Tags",
+    "Priority",
+    "Platform",
+    *STEP_COLUMNS,
+]
+
+
+def _batch_uuid4(n: int) -> List[str]:
+    """
+    Generates n canonical uuid4 strings from a single os.urandom call
+    instead of one syscall per document.
+    """
+
+    raw = os.urandom(16 * n)
+
+    return [
+        str(uuid.UUID(bytes=raw[i * 16:(i + 1) * 16], version=4))
+        for i in range(n)
+    ]
+
+
+async def _spool_upload_to_tempfile(file: UploadFile) -> str:
+    """
+    Streams the upload to a temp file in fixed-size chunks so the parser
+    reads from disk instead of a full in-memory copy. Caller deletes it.
+    """
+
+    suffix = os.path.splitext(file.filename or "")[1]
+
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        try:
+            while chunk := await file.read(_UPLOAD_READ_CHUNK_BYTES):
+                tmp.write(chunk)
+        except Exception:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
 
+    return tmp.name
 
-@router.post("/upload")
-async def upload_and_process_file(
-    file: UploadFile = File(...),
-    current_user: dict = Depends(require_role("editor", "admin")),
-):
 
-    # ==========================================================
-    # VALIDATE FILE TYPE
-    # ==========================================================
+def _read_csv_arrow(path: str) -> pd.DataFrame:
+    """
+    Parses CSV with pyarrow's native reader. Every column is declared as
+    string up front (names taken from the header row), so values such as
+    "001" or "1.10" are kept verbatim rather than type-inferred.
+    Quoted multi-line cells (common in steps / expected results) are
+    allowed.
+    """
+
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        header = next(csv.reader(fh), [])
+
+    table = pacsv.read_csv(
+        path,
+        read_options=pacsv.ReadOptions(encoding="utf8"),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            strings_can_be_null=True,
+        ),
+    )
+
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+async def _enrich_case(
+    index: int,
+    cases: Dict[str, List[Any]],
+    cached: Optional[Dict[str, Any]] = None,
+) -> Tuple[int, Dict[str, Any]]:
+    if cached is not None:
+        return index, cached
+
     try:
-        if not file.filename.endswith((".csv", ".xlsx")):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid file type. Please upload a CSV or XLSX file."
-            )
-    except Exception:
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid file upload request."
+        enrichment = await get_gemini_enrichment_async(
+            cases["description"][index],
+            cases["feature"][index],
+            cases["steps_combined"][index],
+            check_cache=False,
+        )
+    except Exception as err:
+        logger.warning(
+            f"Gemini enrichment failed for test case "
+            f"'{cases['test_case_id'][index]}': {err}"
         )
+        enrichment = {}
 
+    return index, enrichment or {}
 
-    col = get_testcase_collection()
 
-    # ==========================================================
-    # READ FILE → DATAFRAME
-    # ==========================================================
+async def _embed_batch(
+    batch: List[Tuple[int, Dict[str, Any]]],
+    cases: Dict[str, List[Any]],
+) -> Dict[str, Any]:
+    """
+    Embeds one batch of enriched test cases off the event loop.
+
+    Result is column-oriented: parallel lists plus one (n, D) float32
+    matrix per vector field (None when embedding failed).
+    """
+
+    indices = [index for index, _ in batch]
+    summaries = [e.get("summary", "") or "" for _, e in batch]
+
     try:
-        contents = await file.read()
-        buffer = io.BytesIO(contents)
+        matrices = await asyncio.to_thread(
+            embed_multivector_matrices,
+            [cases["description"][i] for i in indices],
+            [cases["steps_combined"][i] for i in indices],
+            summaries,
+        )
+        desc_mat, steps_mat, summary_mat, main_mat = matrices
+        matrices = (
+            desc_mat.astype(np.float16),
+            steps_mat.astype(np.float16),
+            summary_mat.astype(np.float16),
+            main_mat,
+        )
+    except Exception:
+        logger.exception("Batch embedding failed — storing empty vectors")
+        matrices = (None, None, None, None)
+
+    return {
+        "indices": indices,
+        "summaries": summaries,
+        "keywords": [e.get("keywords", []) or [] for _, e in batch],
+        "vectors": dict(zip(_VECTOR_FIELDS, matrices)),
+    }
+
+
+def _iter_batch_documents(
+    batch: Dict[str, Any],
+    cases: Dict[str, List[Any]],
+    doc_ids: List[str],
+    created_at: datetime,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily materializes Mongo documents from a column-oriented batch, so
+    only the documents of the chunk being inserted exist as dicts.
+    """
+
+    vectors = batch["vectors"]
+
+    for i, index in enumerate(batch["indices"]):
+        doc = {
+            "_id": doc_ids[index],
+
+            "Test Case ID": cases["test_case_id"][index],
+            "Feature": cases["feature"][index],
+            "Test Case Description": cases["description"][index],
+            "Pre-requisites": cases["prerequisites"][index],
+            "Steps": cases["steps_combined"][index],
+
+            "TestCaseSummary": batch["summaries"][i],
+            "TestCaseKeywords": batch["keywords"][i],
+        }
 
-        try:
-            if file.filename.endswith(".csv"):
-                df = pd.read_csv(buffer, encoding="utf-8")
+        # VECTORS (side vectors packed as fp16, main_vector stays searchable)
+        for field, matrix in vectors.items():
+            if matrix is None:
+                doc[field] = []
+            elif field == "main_vector":
+                doc[field] = matrix[i].tolist()
             else:
-                df = pd.read_excel(buffer)
-        except Exception as err:
-            logger.error(f"File parse failed: {err}", exc_info=True)
-            raise HTTPException(
-                status_code=400,
-                detail="Parsing failed. Please check the file format."
-            )
+                doc[field] = to_fp16_binary(matrix[i])
 
-        # clean df
-        try:
-            df = df.astype(str).replace(["nan", "NaN", pd.NA], "")
-        except Exception:
-            pass
+        # metadata
+        doc["Tags"] = cases["tags"][index]
+        doc["Priority"] = cases["priority"][index]
+        doc["Platform"] = cases["platform"][index]
 
-        # check TC ID column
+        doc["CreatedAt"] = created_at
+        doc["Popularity"] = 0.0
+
+        yield doc
+
+
+async def _insert_worker(col, queue: asyncio.Queue) -> Tuple[int, int]:
+    """
+    Drains document iterators from the queue and writes them as soon as
+    a full insert chunk accumulates or the producer goes idle.
+    A None item marks the end of the upload. Returns (inserted, rejected).
+
+    Each flush runs as its own task, so up to MONGO_INSERT_CONCURRENCY
+    chunks are on the wire while the next one is still being buffered.
+    """
+
+    semaphore = asyncio.Semaphore(max(1, settings.MONGO_INSERT_CONCURRENCY))
+    flushes: List[asyncio.Task] = []
+    buffer: List[Dict[str, Any]] = []
+
+    async def _flush(chunk: List[Dict[str, Any]]) -> Tuple[int, int]:
         try:
-            if "Test Case ID" not in df.columns:
-                raise HTTPException(
-                    status_code=400,
-                    detail="CSV/XLSX must contain 'Test Case ID' column."
+            return await insert_many_chunked(col, chunk, concurrency=1)
+        finally:
+            semaphore.release()
+
+    async def _start_flush():
+        nonlocal buffer
+
+        # Waiting for a free slot is the backpressure on the producer
+        await semaphore.acquire()
+        flushes.append(asyncio.create_task(_flush(buffer)))
+        buffer = []
+
+        # Surface a failed insert now rather than after the whole upload
+        for task in flushes:
+            if task.done() and task.exception() is not None:
+                raise task.exception()
+
+    try:
+        while True:
+            try:
+                documents = await asyncio.wait_for(
+                    queue.get(),
+                    timeout=settings.UPLOAD_INSERT_IDLE_FLUSH_SECONDS,
                 )
-        except HTTPException:
-            raise
-        except Exception:
-            raise HTTPException(
-                status_code=400,
-                detail="Missing 'Test Case ID' column."
-            )
+            except asyncio.TimeoutError:
+                if buffer:
+                    await _start_flush()
+                continue
 
-        # forward fill TC IDs
-        try:
-            df["Test Case ID"] = (
-                df["Test Case ID"].replace("", pd.NA).ffill()
-            )
-        except Exception:
-            pass
+            if documents is None:
+                break
 
-        # remove empty IDs
-        try:
-            df.dropna(subset=["Test Case ID"], inplace=True)
-            df = df[
-                df["Test Case ID"].str.strip().str.upper().ne("NA") &
-                df["Test Case ID"].str.strip().ne("")
-            ]
-        except Exception:
-            pass
+            for doc in documents:
+                buffer.append(doc)
 
-    except HTTPException:
+                if len(buffer) >= settings.MONGO_INSERT_CHUNK_SIZE:
+                    await _start_flush()
+
+        if buffer:
+            await _start_flush()
+
+        counts = await asyncio.gather(*flushes)
+
+    except BaseException:
+        for task in flushes:
+            task.cancel()
         raise
 
-    except Exception as e:
-        logger.error(f"Error reading file: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error reading file: {e}",
-        )
+    return (
+        sum(inserted for inserted, _ in counts),
+        sum(rejected for _, rejected in counts),
+    )
 
 
-    # ==========================================================
-    # GROUP BY TEST CASE ID
-    # ==========================================================
+async def _update_job(
+    job_id: str,
+    inc: Optional[Dict[str, int]] = None,
+    **fields: Any,
+):
+    update: Dict[str, Any] = {
+        "$set": {**fields, "UpdatedAt": datetime.now(timezone.utc)},
+    }
+
+    if inc:
+        update["$inc"] = inc
+
     try:
-        grouped = df.groupby("Test Case ID")
-    except Exception as e:
-        logger.error(f"Failed to group DataFrame: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail="Failed grouping input file data."
-        )
+        await get_upload_jobs_collection().update_one({"_id": job_id}, update)
+    except Exception as err:
+        # Progress tracking must never break ingestion
+        logger.warning(f"Upload job {job_id} update failed: {err}")
 
-    logger.info(f"Processing {len(grouped)} unique test cases...")
 
-    documents_to_insert = []
+async def _job_heartbeat(job_id: str):
+    """
+    Touches UpdatedAt while the job runs, so a job whose process died
+    can be told apart from one stuck in a long Gemini / dedupe phase.
+    """
 
+    while True:
+        await asyncio.sleep(settings.UPLOAD_JOB_HEARTBEAT_SECONDS)
+        await _update_job(job_id)
 
-    # ==========================================================
-    # PROCESS EACH TEST CASE
-    # ==========================================================
-    for test_case_id, group in grouped:
 
-        # -------------------------------
-        # METADATA FIELDS
-        # -------------------------------
-        try:
-            feature = str(group.get("Feature", "").iloc[0]) if "Feature" in group else ""
-            description = str(group.get("Test Case Description", "").iloc[0]) if "Test Case Description" in group else ""
-            prerequisites = str(group.get("Pre-requisites", "").iloc[0]) if "Pre-requisites" in group else ""
-        except Exception:
-            feature = ""
-            description = ""
-            prerequisites = ""
+async def _process_upload(
+    df: pd.DataFrame,
+    grouped: GroupPositions,
+    job_id: str,
+):
+    """
+    Background entrypoint: runs dedupe → enrichment → embedding → insert
+    for a parsed upload and records the outcome on the job document.
+    """
 
-        # tags
-        tags = []
-        if "Tags" in group:
-            try:
-                raw_tags = str(group.get("Tags", "").iloc[0])
-                tags = [t.strip() for t in raw_tags.split(",") if t.strip()]
-            except Exception:
-                tags = []
+    await _update_job(job_id, status="processing")
 
-        try:
-            priority = str(group.get("Priority", "").iloc[0]) if "Priority" in group else None
-        except Exception:
-            priority = None
+    heartbeat = asyncio.create_task(_job_heartbeat(job_id))
 
-        try:
-            platform = str(group.get("Platform", "").iloc[0]) if "Platform" in group else None
-        except Exception:
-            platform = None
+    try:
+        result = await _run_upload_pipeline(df, grouped, job_id)
+    except Exception as err:
+        logger.error(f"Upload job {job_id} failed: {err}", exc_info=True)
+        await _update_job(job_id, status="failed", error=str(err))
+        return
+    finally:
+        heartbeat.cancel()
 
-        # -------------------------------
-        # BUILD STEPS
-        # -------------------------------
-        steps_list = []
+    await _update_job(job_id, **{"status": "completed", **result})
 
-        for _, row in group.iterrows():
-            try:
-                step_no = str(row.get("Step No.", "")).strip()
-                test_step = str(row.get("Test Step", "")).strip()
-                expected = str(row.get("Expected Result", "")).strip()
 
-                if not test_step:
-                    continue
+async def _run_upload_pipeline(
+    df: pd.DataFrame,
+    grouped: GroupPositions,
+    job_id: str,
+) -> Dict[str, Any]:
 
-                formatted = f"Step {step_no}: {test_step}" if step_no else test_step
+    col = get_testcase_collection()
 
-                if expected:
-                    formatted += f" → Expected: {expected}"
+    logger.info(f"Processing {len(grouped)} unique test cases...")
 
-                steps_list.append(formatted)
+    # ==========================================================
+    # BUILD PER-TEST-CASE INPUTS (METADATA + STEPS)
+    # ==========================================================
+    case_inputs = await build_case_inputs_parallel(df, grouped)
+
+    # Column-oriented store of the test cases that survive dedupe
+    cases: Dict[str, List[Any]] = {field: [] for field in _CASE_FIELDS}
 
-            except Exception:
-                continue
 
-        steps_combined = "\n\n".join(steps_list) if steps_list else ""
+    # ==========================================================
+    # PROCESS EACH TEST CASE
+    # ==========================================================
+    for case in case_inputs:
 
+        test_case_id = case["test_case_id"]
+        feature = case["feature"]
+        description = case["description"]
+        steps_combined = case["steps_combined"]
 
         # ==========================================================
         # 🔥 AI DEDUPE PIPELINE
@@ -234,94 +446,290 @@ async def upload_and_process_file(
         except Exception:
             logger.exception("Dedupe pipeline error — continuing ingestion")
 
-        # ==========================================================
-        # GEMINI ENRICHMENT
-        # ==========================================================
-        try:
-            enrichment = get_gemini_enrichment(
-                description,
-                feature,
-                steps_combined,
-            )
+        for field in _CASE_FIELDS:
+            cases[field].append(case[field])
 
-            summary = enrichment.get("summary", "")
-            keywords = enrichment.get("keywords", []) or []
 
-        except Exception:
-            summary = ""
-            keywords = []
+    total_cases = len(cases["test_case_id"])
 
-        # ==========================================================
-        # EMBEDDINGS
-        # ==========================================================
-        try:
-            desc_emb, steps_emb, summary_emb, main_vector = embed_multivector(
-                description=description,
-                steps=steps_combined,
-                summary=summary,
-            )
-        except Exception:
-            desc_emb, steps_emb, summary_emb, main_vector = [], [], [], []
+    await _update_job(
+        job_id,
+        skipped_duplicates=len(grouped) - total_cases,
+    )
 
+    if not total_cases:
+        return {
+            "inserted": 0,
+            "message": "No valid test cases found (all duplicates skipped).",
+        }
 
-        # ==========================================================
-        # DOCUMENT ASSEMBLY
-        # ==========================================================
-        try:
-            doc = {
-                "_id": str(uuid.uuid4()),
 
-                "Test Case ID": test_case_id,
-                "Feature": feature,
-                "Test Case Description": description,
-                "Pre-requisites": prerequisites,
-                "Steps": steps_combined,
+    # ==========================================================
+    # ENRICH → EMBED → INSERT PIPELINE
+    # ==========================================================
+    doc_ids = _batch_uuid4(total_cases)
+    created_at = datetime.now(timezone.utc)
 
-                "TestCaseSummary": summary,
-                "TestCaseKeywords": keywords,
+    insert_queue: asyncio.Queue = asyncio.Queue()
+    writer = asyncio.create_task(_insert_worker(col, insert_queue))
 
-                # VECTORS
-                "desc_embedding": desc_emb,
-                "steps_embedding": steps_emb,
-                "summary_embedding": summary_emb,
-                "main_vector": main_vector,
+    # One bulk cache lookup up front instead of a find_one per test case
+    cached = await get_cached_enrichments(
+        cases["description"],
+        cases["feature"],
+        cases["steps_combined"],
+    )
 
-                # metadata
-                "Tags": tags,
-                "Priority": priority,
-                "Platform": platform,
+    enrich_tasks = [
+        asyncio.create_task(_enrich_case(i, cases, cached[i]))
+        for i in range(total_cases)
+    ]
 
-                "CreatedAt": datetime.utcnow(),
-                "Popularity": 0.0,
-            }
+    try:
+        batch = []
+
+        # Embed + enqueue batches as enrichments finish, so Mongo writes
+        # and embedding overlap with the remaining Gemini calls
+        for next_done in asyncio.as_completed(enrich_tasks):
+            # A dead writer (e.g. lost Mongo connection) fails the upload;
+            # stop spending Gemini / embedding work on it
+            if writer.done():
+                break
+
+            batch.append(await next_done)
+
+            if len(batch) >= settings.EMBEDDING_BATCH_SIZE:
+                await insert_queue.put(_iter_batch_documents(
+                    await _embed_batch(batch, cases),
+                    cases, doc_ids, created_at,
+                ))
+                await _update_job(job_id, inc={"processed": len(batch)})
+                batch = []
+
+        if batch and not writer.done():
+            await insert_queue.put(_iter_batch_documents(
+                await _embed_batch(batch, cases),
+                cases, doc_ids, created_at,
+            ))
+            await _update_job(job_id, inc={"processed": len(batch)})
 
-            documents_to_insert.append(doc)
+    except Exception:
+        writer.cancel()
+        raise
 
-        except Exception:
-            continue
+    finally:
+        for task in enrich_tasks:
+            task.cancel()
+
+        if not writer.done():
+            await insert_queue.put(None)
 
 
     # ==========================================================
-    # INSERT INTO MONGO
+    # WAIT FOR MONGO WRITES
     # ==========================================================
-    if not documents_to_insert:
-        return {"message": "No valid test cases found (all duplicates skipped)."}
+    inserted, rejected = await writer
 
-    try:
-        result = await col.insert_many(documents_to_insert)
+    logger.info(f"Inserted {inserted} test cases.")
 
-        logger.info(f"Inserted {len(result.inserted_ids)} test cases.")
+    if rejected:
+        logger.error(f"Mongo rejected {rejected} test cases.")
 
         return {
+            "status": "completed_with_errors",
+            "inserted": inserted,
+            "rejected": rejected,
             "message": (
-                f"Successfully processed and stored "
-                f"{len(result.inserted_ids)} unique test cases."
-            )
+                f"Stored {inserted} unique test cases; "
+                f"{rejected} were rejected by the database."
+            ),
+            "error": f"{rejected} test cases failed to insert.",
         }
 
+    return {
+        "inserted": inserted,
+        "message": (
+            f"Successfully processed and stored "
+            f"{inserted} unique test cases."
+        ),
+    }
+
+
+@router.post("/upload", status_code=202)
+async def upload_and_process_file(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    current_user: dict = Depends(require_role("editor", "admin")),
+):
+
+    # ==========================================================
+    # VALIDATE FILE TYPE
+    # ==========================================================
+    ext = os.path.splitext(file.filename or "")[1].lower()
+
+    if ext not in _ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file type. Please upload a CSV or XLSX file."
+        )
+
+
+    # ==========================================================
+    # READ FILE → DATAFRAME
+    # ==========================================================
+    try:
+        upload_path = await _spool_upload_to_tempfile(file)
+
+        try:
+            if ext == ".csv":
+                df = _read_csv_arrow(upload_path)
+            else:
+                df = pd.read_excel(upload_path, engine="calamine")
+        except Exception as err:
+            logger.error(f"File parse failed: {err}", exc_info=True)
+            raise HTTPException(
+                status_code=400,
+                detail="Parsing failed. Please check the file format."
+            )
+        finally:
+            try:
+                os.unlink(upload_path)
+            except OSError as err:
+                logger.warning(f"Failed removing upload temp file: {err}")
+
+        # check TC ID column
+        if "Test Case ID" not in df.columns:
+            raise HTTPException(
+                status_code=400,
+                detail="CSV/XLSX must contain 'Test Case ID' column."
+            )
+
+        # duplicate headers make column lookups ambiguous
+        duplicated = df.columns[df.columns.duplicated()].unique().tolist()
+        if duplicated:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    "CSV/XLSX has duplicate column(s): "
+                    + ", ".join(str(c) for c in duplicated)
+                ),
+            )
+
+        # clean df
+        for column in _USED_COLUMNS:
+            if column in df.columns:
+                df[column] = (
+                    df[column]
+                    .astype("string")
+                    .fillna("")
+                    .replace({"nan": "", "NaN": ""})
+                )
+
+        # forward fill TC IDs, then remove empty / "NA" IDs
+        df["Test Case ID"] = df["Test Case ID"].replace("", pd.NA).ffill()
+        df = df.dropna(subset=["Test Case ID"])
+
+        tc_ids = df["Test Case ID"].str.strip()
+        df = df[tc_ids.ne("") & tc_ids.str.upper().ne("NA")]
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        logger.error(f"Error reading file: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error reading file: {e}",
+        )
+
+
+    # ==========================================================
+    # GROUP BY TEST CASE ID
+    # ==========================================================
+    try:
+        grouped = test_case_row_positions(df)
+    except Exception as e:
+        logger.error(f"Failed to group DataFrame: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed grouping input file data."
+        )
+
+
+    # ==========================================================
+    # QUEUE BACKGROUND PROCESSING
+    # ==========================================================
+    job_id = uuid.uuid4().hex
+    now = datetime.now(timezone.utc)
+
+    try:
+        await get_upload_jobs_collection().insert_one({
+            "_id": job_id,
+            "status": "queued",
+            "filename": file.filename,
+            "total": len(grouped),
+            "processed": 0,
+            "inserted": 0,
+            "skipped_duplicates": 0,
+            "rejected": 0,
+            "message": None,
+            "error": None,
+            "created_by": current_user.get("username"),
+            "CreatedAt": now,
+            "UpdatedAt": now,
+        })
     except Exception as e:
-        logger.error(f"Error inserting MongoDB: {e}", exc_info=True)
+        logger.error(f"Failed creating upload job: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
-            detail=f"Error storing data: {e}",
+            detail="Failed creating upload job.",
         )
+
+    background_tasks.add_task(_process_upload, df, grouped, job_id)
+
+    logger.info(f"Queued upload job {job_id} ({len(grouped)} test cases)")
+
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "total": len(grouped),
+    }
+
+
+@router.get("/upload/{job_id}")
+async def get_upload_status(
+    job_id: str,
+    current_user: dict = Depends(require_role("editor", "admin")),
+):
+    query: Dict[str, Any] = {"_id": job_id}
+
+    # Editors only see their own uploads
+    if current_user.get("role") != "admin":
+        query["created_by"] = current_user.get("username")
+
+    try:
+        job = await get_upload_jobs_collection().find_one(query)
+    except Exception as err:
+        logger.exception(f"MongoDB find_one failed: {err}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed fetching upload job.",
+        )
+
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Upload job not found",
+        )
+
+    # Job whose worker died mid-run (no heartbeat) → report it as failed
+    if job.get("status") in ("queued", "processing"):
+        try:
+            if await fail_stale_upload_jobs(job_id):
+                job = await get_upload_jobs_collection().find_one(query)
+        except Exception as err:
+            logger.warning(f"Stale upload job check failed: {err}")
+
+    job["job_id"] = job.pop("_id")
+
+    return job
@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, Dict, Any
 
 from app.core.config import get_settings
@@ -47,7 +48,8 @@ async def search_similar_testcases(
     # -------------------------------------------------------
 
     try:
-        query_vector = embed_text(query)
+        # model.encode is CPU-bound; keep it off the event loop
+        query_vector = await asyncio.to_thread(embed_text, query)
     except Exception:
         logger.exception("Failed to embed dedupe query")
         return []
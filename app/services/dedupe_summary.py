@@ -1,3 +1,4 @@
+import asyncio
 import time
 
 import google.generativeai as genai
@@ -8,6 +9,58 @@ from app.core.logging import logger
 settings = get_settings()
 
 
+# -------------------------------------------------------
+# Gemini call with retries (blocking)
+# -------------------------------------------------------
+
+def _run_dedupe_summary(prompt: str, fallback: str) -> str:
+    """
+    Blocking Gemini call + retry sleeps; always invoked via to_thread.
+    """
+
+    try:
+        try:
+            model = genai.GenerativeModel("gemini-2.5-flash")
+        except Exception as err:
+            logger.warning(f"Dedupe model init failed: {err}")
+            return fallback
+
+
+        for attempt in range(max(1, settings.GEMINI_RETRIES)):
+            try:
+
+                response = model.generate_content(prompt)
+
+                try:
+                    text = (response.text or "").strip()
+                except Exception:
+                    text = ""
+
+                words = text.split()
+
+                if len(words) >= 8:
+                    # Force exact 12-word output regardless of LLM variation
+                    final = " ".join(words[:12])
+                    return final.strip()
+
+            except Exception as e:
+                logger.warning(
+                    f"Dedupe summary attempt {attempt+1} failed: {e}"
+                )
+
+                try:
+                    time.sleep(settings.GEMINI_RATE_LIMIT_SLEEP)
+                except Exception:
+                    pass
+
+
+    except Exception:
+        logger.error("Dedupe summary fatal error", exc_info=True)
+
+
+    return fallback
+
+
 # -------------------------------------------------------
 # Gemini: 12-word dedupe summary generator
 # -------------------------------------------------------
@@ -65,47 +118,8 @@ async def generate_dedupe_summary(
 
 
     # -------------------------------------------------------
-    # Gemini execution with retries
+    # Gemini execution — sync client, run off the event loop
     # -------------------------------------------------------
 
-    try:
-        try:
-            model = genai.GenerativeModel("gemini-2.5-flash")
-        except Exception as err:
-            logger.warning(f"Dedupe model init failed: {err}")
-            return fallback
-
-
-        for attempt in range(max(1, settings.GEMINI_RETRIES)):
-            try:
-
-                response = model.generate_content(prompt)
-
-                try:
-                    text = (response.text or "").strip()
-                except Exception:
-                    text = ""
-
-                words = text.split()
-
-                if len(words) >= 8:
-                    # Force exact 12-word output regardless of LLM variation
-                    final = " ".join(words[:12])
-                    return final.strip()
-
-            except Exception as e:
-                logger.warning(
-                    f"Dedupe summary attempt {attempt+1} failed: {e}"
-                )
+    return await asyncio.to_thread(_run_dedupe_summary, prompt, fallback)
 
-                try:
-                    time.sleep(settings.GEMINI_RATE_LIMIT_SLEEP)
-                except Exception:
-                    pass
-
-
-    except Exception:
-        logger.error("Dedupe summary fatal error", exc_info=True)
-
-
-    return fallback
@@ -1,3 +1,4 @@
+import asyncio
 import time
 
 import google.generativeai as genai
@@ -11,6 +12,60 @@ settings = get_settings()
 DUPLICATE_TOKEN = "DUPLICATE"
 
 
+# -------------------------------------------------------
+# Gemini call with retries (blocking)
+# -------------------------------------------------------
+
+def _run_duplicate_verification(prompt: str) -> bool:
+    """
+    Blocking Gemini call + retry sleeps; always invoked via to_thread.
+    """
+
+    try:
+
+        try:
+            model = genai.GenerativeModel("gemini-2.5-flash")
+        except Exception as err:
+            logger.warning(f"Dedupe verifier model init failed: {err}")
+            return False
+
+
+        for attempt in range(max(1, settings.GEMINI_RETRIES)):
+
+            try:
+                response = model.generate_content(prompt)
+
+                try:
+                    text = (response.text or "").strip().upper()
+                except Exception:
+                    text = ""
+
+                if DUPLICATE_TOKEN in text:
+                    time.sleep(settings.GEMINI_RATE_LIMIT_SLEEP)
+                    return True
+
+                if "UNIQUE" in text:
+                    time.sleep(settings.GEMINI_RATE_LIMIT_SLEEP)
+                    return False
+
+            except Exception as e:
+                logger.warning(
+                    f"Dedupe verification attempt {attempt+1} failed: {e}"
+                )
+
+                try:
+                    time.sleep(settings.GEMINI_RATE_LIMIT_SLEEP)
+                except Exception:
+                    pass
+
+
+    except Exception:
+        logger.exception("Dedupe verifier fatal error")
+
+
+    return False
+
+
 # -------------------------------------------------------
 # Gemini: Test case duplicate verifier
 # -------------------------------------------------------
@@ -75,49 +130,7 @@ async def llm_verify_duplicate(
 
 
     # -------------------------------------------------------
-    # Gemini execution with retries
+    # Gemini execution — sync client, run off the event loop
     # -------------------------------------------------------
 
-    try:
-
-        try:
-            model = genai.GenerativeModel("gemini-2.5-flash")
-        except Exception as err:
-            logger.warning(f"Dedupe verifier model init failed: {err}")
-            return False
-
-
-        for attempt in range(max(1, settings.GEMINI_RETRIES)):
-
-            try:
-                response = model.generate_content(prompt)
-
-                try:
-                    text = (response.text or "").strip().upper()
-                except Exception:
-                    text = ""
-
-                if DUPLICATE_TOKEN in text:
-                    time.sleep(settings.GEMINI_RATE_LIMIT_SLEEP)
-                    return True
-
-                if "UNIQUE" in text:
-                    time.sleep(settings.GEMINI_RATE_LIMIT_SLEEP)
-                    return False
-
-            except Exception as e:
-                logger.warning(
-                    f"Dedupe verification attempt {attempt+1} failed: {e}"
-                )
-
-                try:
-                    time.sleep(settings.GEMINI_RATE_LIMIT_SLEEP)
-                except Exception:
-                    pass
-
-
-    except Exception:
-        logger.exception("Dedupe verifier fatal error")
-
-
-    return False
+    return await asyncio.to_thread(_run_duplicate_verification, prompt)
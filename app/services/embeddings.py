@@ -1,6 +1,7 @@
 import numpy as np
-from typing import List, Optional, Union, Tuple
+from typing import Any, List, Optional, Union, Tuple
 
+from bson import Binary
 from sentence_transformers import SentenceTransformer
 
 from app.core.config import get_settings
@@ -70,6 +71,15 @@ def _normalize_text(text: str) -> str:
         return ""
 
 
+def _steps_to_text(steps: Union[str, List[str]]) -> str:
+    try:
+        if isinstance(steps, list):
+            return " ".join(str(s) for s in steps if s)
+        return str(steps or "")
+    except Exception:
+        return ""
+
+
 def numpy_to_list(v) -> List[float]:
     if v is None:
         return []
@@ -83,6 +93,40 @@ def numpy_to_list(v) -> List[float]:
             return []
 
 
+# -----------------------------------------------------------------------
+# Storage encoding — fp16 side vectors
+# -----------------------------------------------------------------------
+#
+# desc/steps/summary embeddings are only read back for in-app cosine
+# scoring, so they are stored as packed float16 bytes (~4x smaller than a
+# BSON double array). main_vector stays a float array because the Atlas
+# vector index searches it directly.
+
+def to_fp16_binary(v) -> Binary:
+    try:
+        return Binary(np.asarray(v, dtype=np.float16).tobytes())
+    except Exception:
+        return Binary(b"")
+
+
+def from_stored_vector(v: Any) -> Union[np.ndarray, List[float]]:
+    """
+    Decodes a stored embedding: packed fp16 bytes (current format) or a
+    plain float list (documents written before fp16 storage).
+    """
+
+    if v is None:
+        return []
+
+    if isinstance(v, (bytes, bytearray)):
+        try:
+            return np.frombuffer(v, dtype=np.float16).astype(np.float32)
+        except Exception:
+            return []
+
+    return v
+
+
 # -----------------------------------------------------------------------
 # RAW TEXT EMBEDDING — MATCHES ORIGINAL ENGINE
 # -----------------------------------------------------------------------
@@ -146,13 +190,7 @@ def embed_multivector(
         main_vector
     """
 
-    try:
-        if isinstance(steps, list):
-            steps_text = " ".join(str(s) for s in steps if s)
-        else:
-            steps_text = str(steps or "")
-    except Exception:
-        steps_text = ""
+    steps_text = _steps_to_text(steps)
 
     try:
         desc_emb = embed_text(description)
@@ -202,3 +240,59 @@ def embed_multivector(
             main_vector = []
 
     return desc_emb, steps_emb, summary_emb, main_vector
+
+
+# -----------------------------------------------------------------------
+# BATCHED MULTI-VECTOR FUSION — SAME OUTPUT AS embed_multivector
+# -----------------------------------------------------------------------
+
+def embed_multivector_matrices(
+    descriptions: List[str],
+    steps_list: List[Union[str, List[str]]],
+    summaries: List[str],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encodes all description / steps / summary texts in a single
+    model.encode call (EMBEDDING_BATCH_SIZE per forward pass).
+
+    Returns four contiguous float32 matrices of shape (N, D):
+        desc, steps, summary, main (row-wise mean of the three)
+
+    Raises on encode failure; callers decide how to degrade.
+    """
+
+    n = len(descriptions)
+
+    if len(steps_list) != n or len(summaries) != n:
+        raise ValueError(
+            "descriptions, steps_list and summaries must have equal length"
+        )
+
+    model = _ensure_model()
+
+    texts = [
+        _normalize_text(t or "")
+        for t in (
+            list(descriptions)
+            + [_steps_to_text(s) for s in steps_list]
+            + list(summaries)
+        )
+    ]
+
+    matrix = np.asarray(
+        model.encode(
+            texts,
+            batch_size=max(1, settings.EMBEDDING_BATCH_SIZE),
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        ),
+        dtype=np.float32,
+    )
+
+    desc_mat = matrix[:n]
+    steps_mat = matrix[n:2 * n]
+    summary_mat = matrix[2 * n:]
+    main_mat = (desc_mat + steps_mat + summary_mat) / np.float32(3.0)
+
+    return desc_mat, steps_mat, summary_mat, main_mat
@@ -1,16 +1,31 @@
+import asyncio
+import hashlib
 import time
 import re
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Optional
 
 import google.generativeai as genai
 
 from app.core.config import get_settings
 from app.core.logging import logger
+from app.db.mongo import get_enrichment_cache_collection
 from app.services.keywords import extract_keywords, build_fallback_summary
 
 
 settings = get_settings()
 
+_ENRICHMENT_MODEL = "gemini-2.5-flash"
+
+# Caps in-flight Gemini enrichment calls across concurrent uploads
+_enrichment_semaphore: Optional[asyncio.Semaphore] = None
+
+# Cache keys are scoped to the model + prompt template that produced them,
+# so changing either stops serving stale summaries/keywords
+_enrichment_cache_key_base = hashlib.blake2b(
+    f"{_ENRICHMENT_MODEL}\0{settings.TestCase_Enrichment_Prompt}\0".encode(),
+    digest_size=16,
+)
+
 
 # -------------------------------------------------------
 # Clean Gemini text output
@@ -157,11 +172,13 @@ def get_gemini_enrichment(
             return {
                 "summary": fallback_summary,
                 "keywords": fallback_keywords,
+                "source": "fallback",
             }
     except Exception:
         return {
             "summary": fallback_summary,
             "keywords": fallback_keywords,
+            "source": "fallback",
         }
 
 
@@ -180,6 +197,7 @@ def get_gemini_enrichment(
         return {
             "summary": fallback_summary,
             "keywords": fallback_keywords,
+            "source": "fallback",
         }
 
 
@@ -189,12 +207,13 @@ def get_gemini_enrichment(
 
     try:
         try:
-            model = genai.GenerativeModel("gemini-2.5-flash")
+            model = genai.GenerativeModel(_ENRICHMENT_MODEL)
         except Exception as err:
             logger.warning(f"Gemini model initialization failed: {err}")
             return {
                 "summary": fallback_summary,
                 "keywords": fallback_keywords,
+                "source": "fallback",
             }
 
         for attempt in range(max(1, settings.GEMINI_RETRIES)):
@@ -217,6 +236,7 @@ def get_gemini_enrichment(
                     return {
                         "summary": summary,
                         "keywords": keywords,
+                        "source": "gemini",
                     }
 
             except Exception as e:
@@ -244,6 +264,9 @@ def get_gemini_enrichment(
 
             summary, keywords = _parse_gemini_enrichment_text(text)
 
+            # Only a Gemini-authored summary is worth caching
+            source = "gemini" if summary else "fallback"
+
             if not summary:
                 summary = fallback_summary
 
@@ -263,12 +286,14 @@ def get_gemini_enrichment(
             return {
                 "summary": summary,
                 "keywords": keywords,
+                "source": source,
             }
 
         except Exception:
             return {
                 "summary": fallback_summary,
                 "keywords": fallback_keywords,
+                "source": "fallback",
             }
 
     except Exception as e:
@@ -280,4 +305,143 @@ def get_gemini_enrichment(
         return {
             "summary": fallback_summary,
             "keywords": fallback_keywords,
+            "source": "fallback",
         }
+
+
+# -------------------------------------------------------
+# Async entrypoint — bounded thread offload
+# -------------------------------------------------------
+
+def _get_enrichment_semaphore() -> asyncio.Semaphore:
+    global _enrichment_semaphore
+
+    if _enrichment_semaphore is None:
+        _enrichment_semaphore = asyncio.Semaphore(
+            max(1, settings.GEMINI_MAX_CONCURRENCY)
+        )
+    return _enrichment_semaphore
+
+
+def _enrichment_cache_key(
+    test_case_description: str,
+    feature: str,
+    steps: str,
+) -> str:
+    key = _enrichment_cache_key_base.copy()
+    key.update(
+        f"{test_case_description or ''}\0{feature or ''}\0{steps or ''}".encode()
+    )
+    return key.hexdigest()
+
+
+def _cached_enrichment(hit: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "summary": hit.get("summary", ""),
+        "keywords": hit.get("keywords", []) or [],
+        "source": "cache",
+    }
+
+
+async def _enrichment_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        hit = await get_enrichment_cache_collection().find_one({"_id": key})
+    except Exception as err:
+        logger.warning(f"Enrichment cache lookup failed: {err}")
+        return None
+
+    return _cached_enrichment(hit) if hit else None
+
+
+async def get_cached_enrichments(
+    descriptions: List[str],
+    features: List[str],
+    steps_list: List[str],
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Bulk cache lookup for an upload: one $in query instead of one
+    find_one per test case. Returns a list aligned with the inputs,
+    None where there is no cached enrichment.
+    """
+
+    misses: List[Optional[Dict[str, Any]]] = [None] * len(descriptions)
+
+    if not settings.GOOGLE_API_KEY or not descriptions:
+        return misses
+
+    keys = [
+        _enrichment_cache_key(d, f, s)
+        for d, f, s in zip(descriptions, features, steps_list)
+    ]
+
+    try:
+        hits = {
+            hit["_id"]: _cached_enrichment(hit)
+            async for hit in get_enrichment_cache_collection().find(
+                {"_id": {"$in": list(set(keys))}}
+            )
+        }
+    except Exception as err:
+        logger.warning(f"Enrichment cache bulk lookup failed: {err}")
+        return misses
+
+    return [hits.get(key) for key in keys]
+
+
+async def _enrichment_cache_set(key: str, enrichment: Dict[str, Any]):
+    try:
+        await get_enrichment_cache_collection().update_one(
+            {"_id": key},
+            {"$setOnInsert": {
+                "summary": enrichment.get("summary", ""),
+                "keywords": enrichment.get("keywords", []) or [],
+            }},
+            upsert=True,
+        )
+    except Exception as err:
+        logger.warning(f"Enrichment cache write failed: {err}")
+
+
+async def get_gemini_enrichment_async(
+    test_case_description: str,
+    feature: str,
+    steps: str = "",
+    check_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Non-blocking variant of get_gemini_enrichment.
+
+    Results are cached in Mongo by a blake2b hash of (model, prompt
+    template, description, feature, steps), so re-uploaded test cases skip
+    Gemini. Only Gemini-authored results are cached, never local
+    fallbacks. Bulk callers that already ran get_cached_enrichments pass
+    check_cache=False to skip the per-item lookup.
+
+    The google.generativeai client is synchronous, so each call runs in a
+    worker thread; the shared semaphore keeps concurrent Gemini requests
+    under GEMINI_MAX_CONCURRENCY to respect provider rate limits.
+    """
+
+    cache_enabled = bool(settings.GOOGLE_API_KEY)
+
+    if cache_enabled:
+        key = _enrichment_cache_key(test_case_description, feature, steps)
+
+    if cache_enabled and check_cache:
+        cached = await _enrichment_cache_get(key)
+
+        if cached is not None:
+            return cached
+
+    async with _get_enrichment_semaphore():
+        enrichment = await asyncio.to_thread(
+            get_gemini_enrichment,
+            test_case_description,
+            feature,
+            steps,
+        )
+
+    if cache_enabled and enrichment.get("source") == "gemini":
+        await _enrichment_cache_set(key, enrichment)
+
+    return enrichment
@@ -5,6 +5,7 @@ import numpy as np
 
 from app.core.config import get_settings
 from app.core.logging import logger
+from app.services.embeddings import from_stored_vector
 from app.services.rerank import rerank_with_gemini
 
 
@@ -93,9 +94,9 @@ def build_candidates(
         # Semantic similarity — EXACT BASELINE LOGIC
         # -------------------------------------------------
         try:
-            desc_emb = payload.get("desc_embedding", [])
-            steps_emb = payload.get("steps_embedding", [])
-            summary_emb = payload.get("summary_embedding", [])
+            desc_emb = from_stored_vector(payload.get("desc_embedding", []))
+            steps_emb = from_stored_vector(payload.get("steps_embedding", []))
+            summary_emb = from_stored_vector(payload.get("summary_embedding", []))
         except Exception:
             desc_emb, steps_emb, summary_emb = [], [], []
 
@@ -0,0 +1,254 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import get_settings
+from app.core.logging import logger
+
+
+settings = get_settings()
+_assembly_pool: Optional[ProcessPoolExecutor] = None
+
+_MAX_DEFAULT_ASSEMBLY_WORKERS = 4
+
+STEP_COLUMNS = ["Step No.", "Test Step", "Expected Result"]
+
+# U+2192 — must stay a real arrow; stored Steps text is embedded verbatim
+_EXPECTED_SEP = " \u2192 Expected: "
+
+GroupPositions = List[Tuple[str, Union[slice, np.ndarray]]]
+
+
+# -----------------------------------------------------------------------
+# Grouping & step formatting — pure pandas/numpy
+# -----------------------------------------------------------------------
+
+def test_case_row_positions(df: pd.DataFrame) -> GroupPositions:
+    """
+    Returns (test_case_id, row positions) per test case, ordered by ID.
+
+    Exported sheets are usually already sorted by Test Case ID, in which
+    case the groups are contiguous runs found with one linear numpy scan;
+    otherwise falls back to pandas' hash-based groupby.
+    """
+
+    ids = df["Test Case ID"].to_numpy()
+
+    if len(ids) == 0:
+        return []
+
+    if np.all(ids[:-1] <= ids[1:]):
+        starts = np.concatenate(([0], np.flatnonzero(ids[1:] != ids[:-1]) + 1))
+        ends = np.append(starts[1:], len(ids))
+
+        return [
+            (ids[start], slice(start, end))
+            for start, end in zip(starts.tolist(), ends.tolist())
+        ]
+
+    return list(df.groupby("Test Case ID").indices.items())
+
+
+def format_step_lines(df: pd.DataFrame) -> np.ndarray:
+    """
+    Formats every row as "Step N: <step> → Expected: <result>" in one
+    vectorized pass; rows without a test step yield "". Indexed by row
+    position so groups can slice it directly.
+    """
+
+    step_cols = (
+        df.reindex(columns=STEP_COLUMNS, fill_value="")
+        .astype(str)
+        .apply(lambda c: c.str.strip())
+    )
+
+    step_no = step_cols["Step No."]
+    test_step = step_cols["Test Step"]
+    expected = step_cols["Expected Result"]
+
+    prefix = ("Step " + step_no + ": ").where(step_no != "", "")
+    suffix = (_EXPECTED_SEP + expected).where(expected != "", "")
+
+    lines = (prefix + test_step + suffix).where(test_step != "", "")
+
+    return lines.to_numpy(dtype=object)
+
+
+# -----------------------------------------------------------------------
+# Per-test-case inputs — runs inline or inside a pool worker
+# -----------------------------------------------------------------------
+
+def build_case_inputs(
+    df: pd.DataFrame,
+    grouped: Optional[GroupPositions] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Turns a cleaned upload frame into one dict per test case:
+
+        test_case_id, feature, description, prerequisites,
+        steps_combined, tags, priority, platform
+
+    Metadata comes from the first row of each test case. Module-level and
+    free of I/O so it can be shipped to a worker process.
+
+    `grouped` may be passed when the caller already computed it for this
+    exact frame; otherwise it is derived here.
+    """
+
+    if grouped is None:
+        grouped = test_case_row_positions(df)
+
+    meta = (
+        df.drop_duplicates(subset="Test Case ID", keep="first")
+        .set_index("Test Case ID")
+    )
+
+    if "Tags" in meta.columns:
+        meta["_tags"] = (
+            meta["Tags"].astype(str).str.split(",")
+            .apply(lambda xs: [t.strip() for t in xs if t.strip()])
+        )
+
+    # No catch-all here: a formatting error must fail the upload rather
+    # than silently store every test case with empty Steps
+    step_lines = format_step_lines(df)
+
+    inputs: List[Dict[str, Any]] = []
+
+    for test_case_id, positions in grouped:
+        try:
+            row = meta.loc[test_case_id]
+
+            feature = str(row.get("Feature", ""))
+            description = str(row.get("Test Case Description", ""))
+            prerequisites = str(row.get("Pre-requisites", ""))
+            tags = list(row.get("_tags", None) or [])
+
+            priority = row.get("Priority", None)
+            priority = str(priority) if priority is not None else None
+
+            platform = row.get("Platform", None)
+            platform = str(platform) if platform is not None else None
+        except Exception:
+            feature = ""
+            description = ""
+            prerequisites = ""
+            tags = []
+            priority = None
+            platform = None
+
+        inputs.append({
+            "test_case_id": test_case_id,
+            "feature": feature,
+            "description": description,
+            "prerequisites": prerequisites,
+            "steps_combined": "\n\n".join(
+                line for line in step_lines[positions] if line
+            ),
+            "tags": tags,
+            "priority": priority,
+            "platform": platform,
+        })
+
+    return inputs
+
+
+# -----------------------------------------------------------------------
+# Process pool lifecycle
+# -----------------------------------------------------------------------
+
+def _assembly_workers() -> int:
+    """
+    Worker count: UPLOAD_PARALLEL_WORKERS if set, else the CPUs this
+    process may actually run on (sched_getaffinity honours cpusets /
+    container pinning, unlike os.cpu_count) capped at
+    _MAX_DEFAULT_ASSEMBLY_WORKERS — each spawn worker imports pandas and
+    receives a pickled slice of the frame.
+    """
+
+    if settings.UPLOAD_PARALLEL_WORKERS:
+        return max(1, settings.UPLOAD_PARALLEL_WORKERS)
+
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # macOS / Windows
+        available = os.cpu_count() or 1
+
+    return max(1, min(_MAX_DEFAULT_ASSEMBLY_WORKERS, available))
+
+
+def _get_assembly_pool() -> ProcessPoolExecutor:
+    global _assembly_pool
+
+    if _assembly_pool is None:
+        # spawn: never fork a process that holds Mongo / thread-pool state
+        _assembly_pool = ProcessPoolExecutor(
+            max_workers=_assembly_workers(),
+            mp_context=get_context("spawn"),
+        )
+    return _assembly_pool
+
+
+def shutdown_assembly_pool():
+    global _assembly_pool
+
+    try:
+        if _assembly_pool is not None:
+            logger.info("Shutting down test case assembly pool...")
+            _assembly_pool.shutdown(wait=False, cancel_futures=True)
+            _assembly_pool = None
+    except Exception as err:
+        logger.warning(f"Failed shutting down assembly pool cleanly: {err}")
+
+
+# -----------------------------------------------------------------------
+# Fan-out entrypoint
+# -----------------------------------------------------------------------
+
+async def build_case_inputs_parallel(
+    df: pd.DataFrame,
+    grouped: GroupPositions,
+) -> List[Dict[str, Any]]:
+    """
+    Builds per-test-case inputs, fanning large uploads out across CPU
+    cores. The frame is split on test case boundaries so every group lands
+    whole in exactly one worker; results keep the original ID order.
+
+    Small uploads run in a thread instead — pool start-up and pickling the
+    frame would cost more than the work itself.
+    """
+
+    workers = _assembly_workers()
+
+    if len(df) < settings.UPLOAD_PARALLEL_MIN_ROWS or workers < 2 or len(grouped) < 2:
+        return await asyncio.to_thread(build_case_inputs, df, grouped)
+
+    group_chunks = np.array_split(np.arange(len(grouped)), workers)
+
+    row_numbers = np.arange(len(df))
+    slices = []
+
+    for chunk in group_chunks:
+        if len(chunk) == 0:
+            continue
+
+        positions = np.concatenate([
+            row_numbers[grouped[i][1]] for i in chunk
+        ])
+        slices.append(df.iloc[positions])
+
+    loop = asyncio.get_running_loop()
+    pool = _get_assembly_pool()
+
+    results = await asyncio.gather(*[
+        loop.run_in_executor(pool, build_case_inputs, part)
+        for part in slices
+    ])
+
+    return [case for part in results for case in part]